@@ -14,7 +14,8 @@ from toomanythreads import ThreadedServer
 
 from . import extract_title_from_html, PageConfig, generate_color_from_name, DEBUG, check_type, \
     are_both_sessioned_server
-from .templates import microservice_iframe, index, fastmicroservices_css
+from .templates import template_tree, template_hash, skeleton_tree, templates_provisioned, write_templates_stamp, \
+    clear_templates_stamp
 
 
 class Macroservice(FastJ2, CWD):
@@ -28,28 +29,21 @@ class Macroservice(FastJ2, CWD):
         #         "Macroservices are only compatible with P2D2.Database!\nSee https://pypi.org/project/p2d2/")
         for kwarg in kwargs:
             setattr(self, kwarg, kwargs.get(kwarg))
+        cwd = Path.cwd()
+        templates = cwd / "templates"
+        provisioned = templates_provisioned(templates)
+        if provisioned and self.verbose: log.debug(f"{self}: Templates unchanged ({template_hash[:12]}), skipping provisioning")
         FastJ2.__init__(
             self,
-            {
-                "templates": {
-                    "css": {
-                        "9-fastmicroservices": {
-                            "fastmicroservices.css": fastmicroservices_css
-                        }
-                    },
-                    "html": {
-                        "content": {
-                            "microservice_iframe.html": microservice_iframe,
-                            "index.html": index,
-                            "static_pages": {
-
-                            },
-                        }
-                    },
-                }
-            },
-            cwd=Path.cwd()
+            skeleton_tree(template_tree) if provisioned else template_tree,
+            cwd=cwd
         )
+        if self.templates._path.resolve() != templates.resolve():
+            log.warning(f"{self}: Templates were provisioned to {self.templates._path}, expected {templates}; not stamping")
+            clear_templates_stamp(templates)
+            if provisioned: FastJ2.__init__(self, template_tree, cwd=cwd)
+        elif not provisioned:
+            write_templates_stamp(templates)
         self.microservices = {}
         self.cached_pages = []
         self.templates: Path = self.templates._path
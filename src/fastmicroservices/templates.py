@@ -1,3 +1,8 @@
+import hashlib
+from pathlib import Path
+
+from loguru import logger as log
+
 index = """
 <div class="fast-microservices-topbar">
     <div class="fast-microservices-logo">fastmicroservices</div>
@@ -139,4 +144,106 @@ body {
 .fast-microservices-welcome-subtitle {
   opacity: 0.7;
 }
-"""
\ No newline at end of file
+"""
+
+
+template_tree = {
+    "templates": {
+        "css": {
+            "9-fastmicroservices": {
+                "fastmicroservices.css": fastmicroservices_css
+            }
+        },
+        "html": {
+            "content": {
+                "microservice_iframe.html": microservice_iframe,
+                "index.html": index,
+                "static_pages": {
+
+                },
+            }
+        },
+    }
+}
+
+STAMP_NAME = ".fastmicroservices.sha256"
+
+
+def flatten_tree(tree: dict, root: Path = Path()) -> dict:
+    """Flatten a nested template tree into {relative path: content}, directories map to None"""
+    flat = {}
+    for name, value in tree.items():
+        path = root / name
+        if isinstance(value, dict):
+            flat[path] = None
+            flat.update(flatten_tree(value, path))
+        else:
+            flat[path] = value
+    return flat
+
+
+def skeleton_tree(tree: dict) -> dict:
+    """Copy of the template tree with the files stripped out, keeping only directories"""
+    return {name: skeleton_tree(value) for name, value in tree.items() if isinstance(value, dict)}
+
+
+def hash_tree(tree: dict) -> str:
+    """Content hash of a template tree, stable across processes"""
+    digest = hashlib.sha256()
+    for path, content in sorted(flatten_tree(tree).items(), key=lambda item: item[0].as_posix()):
+        digest.update(path.as_posix().encode())
+        digest.update(b"\0")
+        if content is not None: digest.update(content.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+template_hash = hash_tree(template_tree)
+
+
+def disk_tree(templates: Path, tree: dict) -> dict | None:
+    """Read the files of tree back from under templates, None if any of them is missing"""
+    found = {}
+    for name, value in tree.items():
+        target = templates / name
+        if isinstance(value, dict):
+            if not target.is_dir(): return None
+            sub = disk_tree(target, value)
+            if sub is None: return None
+            found[name] = sub
+        else:
+            try:
+                found[name] = target.read_text(encoding="utf-8")
+            except OSError:
+                return None
+    return found
+
+
+def templates_provisioned(templates: Path, tree: dict = template_tree, expected: str = template_hash) -> bool:
+    """True if the stamp matches and the templated files on disk still hash to exactly this tree"""
+    stamp = templates / STAMP_NAME
+    try:
+        if stamp.read_text(encoding="utf-8").strip() != expected: return False
+    except OSError:
+        return False
+    on_disk = disk_tree(templates, tree["templates"])
+    if on_disk is None or hash_tree({"templates": on_disk}) != expected:
+        log.debug(f"Templates under {templates} are missing or were modified, reprovisioning")
+        return False
+    return True
+
+
+def write_templates_stamp(templates: Path, expected: str = template_hash) -> None:
+    """Record the hash of the tree that was just provisioned into templates"""
+    try:
+        (templates / STAMP_NAME).write_text(expected, encoding="utf-8")
+    except OSError as e:
+        log.warning(f"Could not write template stamp to {templates}: {e}")
+
+
+def clear_templates_stamp(templates: Path) -> None:
+    """Drop a stamp so the next start provisions the full tree again"""
+    try:
+        (templates / STAMP_NAME).unlink(missing_ok=True)
+    except OSError as e:
+        log.warning(f"Could not remove template stamp from {templates}: {e}")
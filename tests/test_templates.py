@@ -0,0 +1,136 @@
+import subprocess
+import sys
+from types import SimpleNamespace
+
+from starlette.testclient import TestClient
+from toomanythreads import ThreadedServer
+
+from fastmicroservices import Macroservice
+from fastmicroservices import templates as t
+from fastmicroservices.templates import template_tree, template_hash, flatten_tree, skeleton_tree, hash_tree, \
+    templates_provisioned, write_templates_stamp
+
+
+def provision(templates):
+    for path, content in flatten_tree(template_tree["templates"]).items():
+        target = templates / path
+        if content is None: target.mkdir(parents=True, exist_ok=True)
+        else: target.write_text(content, encoding="utf-8")
+
+
+def test_hash_tree_is_stable():
+    assert hash_tree(template_tree) == hash_tree(template_tree) == template_hash
+
+
+def test_hash_tree_changes_with_content():
+    tree = {"templates": {"index.html": "<p>a</p>"}}
+    assert hash_tree(tree) != hash_tree({"templates": {"index.html": "<p>b</p>"}})
+
+
+def test_hash_tree_changes_with_path():
+    tree = {"templates": {"index.html": "<p>a</p>"}}
+    assert hash_tree(tree) != hash_tree({"templates": {"home.html": "<p>a</p>"}})
+    assert hash_tree(tree) != hash_tree({"templates": {"html": {"index.html": "<p>a</p>"}}})
+
+
+def test_skeleton_tree_keeps_only_directories():
+    assert skeleton_tree(template_tree) == {
+        "templates": {
+            "css": {"9-fastmicroservices": {}},
+            "html": {"content": {"static_pages": {}}},
+        }
+    }
+
+
+def test_not_provisioned_without_stamp(tmp_path):
+    provision(tmp_path)
+    assert not templates_provisioned(tmp_path)
+
+
+def test_not_provisioned_with_stale_stamp(tmp_path):
+    provision(tmp_path)
+    write_templates_stamp(tmp_path, "0" * 64)
+    assert not templates_provisioned(tmp_path)
+
+
+def test_not_provisioned_with_missing_file(tmp_path):
+    provision(tmp_path)
+    write_templates_stamp(tmp_path)
+    (tmp_path / "html" / "content" / "index.html").unlink()
+    assert not templates_provisioned(tmp_path)
+
+
+def test_not_provisioned_with_modified_file(tmp_path):
+    provision(tmp_path)
+    write_templates_stamp(tmp_path)
+    (tmp_path / "html" / "content" / "index.html").write_text("", encoding="utf-8")
+    assert not templates_provisioned(tmp_path)
+
+
+def test_provisioned_after_stamp(tmp_path):
+    provision(tmp_path)
+    write_templates_stamp(tmp_path)
+    assert templates_provisioned(tmp_path)
+
+
+def test_write_templates_stamp_warns_on_unwritable_dir(tmp_path, monkeypatch):
+    warnings = []
+    monkeypatch.setattr(t.log, "warning", warnings.append)
+    write_templates_stamp(tmp_path / "missing")
+    assert len(warnings) == 1
+    assert not (tmp_path / "missing").exists()
+
+
+def test_import_time_of_own_modules():
+    """Our own modules should be a rounding error next to fastapi & co, keep them under 50ms self time"""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import fastmicroservices"],
+        capture_output=True, text=True, check=True
+    )
+    own = {}
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line: continue
+        self_us, _, name = line.removeprefix("import time:").split("|")
+        if not self_us.strip().isdigit(): continue
+        if name.strip().startswith("fastmicroservices"): own[name.strip()] = int(self_us)
+    assert "fastmicroservices.templates" in own
+    for name, self_us in own.items():
+        assert self_us < 50_000, f"{name} took {self_us}us to import"
+
+
+class Server(Macroservice, ThreadedServer):
+    def __init__(self):
+        ThreadedServer.__init__(self)
+        Macroservice.__init__(self)
+
+
+def test_restart_skips_provisioning_and_still_renders(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    templates = tmp_path / "templates"
+    files = [templates / path for path, content in flatten_tree(template_tree["templates"]).items() if content]
+
+    Server()
+    assert templates_provisioned(templates)
+    before = {f: (f.stat().st_mtime_ns, f.read_text(encoding="utf-8")) for f in files}
+
+    server = Server()
+    assert {f: (f.stat().st_mtime_ns, f.read_text(encoding="utf-8")) for f in files} == before
+
+    server["svc"] = SimpleNamespace(url="http://localhost:1")
+    client = TestClient(server)
+    res = client.get("/")
+    assert res.status_code == 200
+    assert "fast-microservices-topbar" in res.text
+    res = client.get("/page/svc")
+    assert res.status_code == 200
+    assert '<iframe src="/microservice/svc/' in res.text
+
+
+def test_restart_repairs_modified_template(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    index = tmp_path / "templates" / "html" / "content" / "index.html"
+
+    Server()
+    index.write_text("", encoding="utf-8")
+    Server()
+    assert index.read_text(encoding="utf-8") == template_tree["templates"]["html"]["content"]["index.html"]